@@ -6,24 +6,87 @@
 
 import socket
 import logging
-import json
 import struct
 import argparse
 
+import orjson
+
 # Конфигурация логирования
 logging.basicConfig(
     level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s'
 )
 
+# Размер буферов отправки и приёма сокета (байт)
+SOCKET_BUFFER_SIZE = 2 * 1024 * 1024
+
+# Коды операций бинарного протокола запросов
+OP_LIST = 1
+OP_GET = 2
+
+# Бинарный запрос GET: код операции, длина имени файла (байт),
+# начало и конец отрезка (сек); за ним следует имя файла в UTF-8
+GET_REQUEST = struct.Struct('!BH2d')
+
+
+def _recv_exact(sock, size):
+    """
+    Принимает ровно size байт из сокета в заранее выделенный буфер.
+    Возвращает меньше данных, если сервер закрыл соединение раньше.
+    """
+    buf = bytearray(size)
+    view = memoryview(buf)
+    pos = 0
+    while pos < size:
+        n = sock.recv_into(view[pos:], size - pos)
+        if not n:
+            break
+        pos += n
+    # При обрыве соединения укорачиваем буфер на месте, без копирования
+    view.release()
+    del buf[pos:]
+    return buf
+
+
+def recv_response(sock):
+    """
+    Принимает ответ сервера: 1 байт статуса + 4 байта длины + данные.
+    Возвращает пару (статус, данные) или None, если ответ получен не полностью.
+    """
+    # Статус и длина читаются одним вызовом
+    header = _recv_exact(sock, 5)
+    if not header:
+        print("Ошибка: не получен статус от сервера.")
+        return None
+    if len(header) < 5:
+        print("Ошибка получения заголовка от сервера.")
+        return None
+
+    status = bytes(header[:1])
+    data_length = struct.unpack_from('!I', header, 1)[0]
+    received = _recv_exact(sock, data_length)
+    if len(received) < data_length:
+        print("Ошибка получения данных.")
+        return None
+    return status, received
+
 
 def get_audio_list(sock):
     """
     Запрашивает список аудиофайлов у сервера и выводит его.
     """
     try:
-        sock.sendall("LIST\n".encode('utf-8'))
-        data = sock.recv(4096)
-        audio_list = json.loads(data.decode('utf-8'))
+        sock.sendall(bytes([OP_LIST]))
+        response = recv_response(sock)
+        if response is None:
+            return
+        status, data = response
+        if status == b'0':
+            print("Ошибка от сервера:", data.decode('utf-8'))
+            return
+        if status != b'L':
+            print("Неизвестный статус, полученный от сервера.")
+            return
+        audio_list = orjson.loads(data)
         print("Доступные аудиофайлы:")
         for audio in audio_list:
             print(
@@ -49,38 +112,35 @@ def get_audio_segment(sock):
         print("Ошибка ввода, попробуйте снова.")
         return
 
-    command = f"GET {filename} {start_time} {end_time}\n"
     try:
-        sock.sendall(command.encode('utf-8'))
+        start_sec = float(start_time)
+        end_sec = float(end_time)
+    except ValueError:
+        print("Параметры времени должны быть числами.")
+        return
+
+    filename_bytes = filename.encode('utf-8')
+    if len(filename_bytes) > 0xFFFF:
+        print("Слишком длинное имя файла.")
+        return
+
+    command = GET_REQUEST.pack(OP_GET, len(filename_bytes), start_sec, end_sec) + filename_bytes
+    try:
+        sock.sendall(command)
     except Exception as e:
         logging.error("Ошибка отправки команды: %s", e)
         print("Не удалось отправить команду серверу.")
         return
 
-    # Сначала принимаем 1 байт статуса
-    status = sock.recv(1)
-    if not status:
-        print("Ошибка: не получен статус от сервера.")
+    try:
+        response = recv_response(sock)
+    except Exception as e:
+        logging.error("Ошибка при получении данных: %s", e)
+        print("Ошибка получения данных.")
         return
-
-    # Затем принимаем 4 байта, определяющие длину сообщения
-    header = sock.recv(4)
-    if len(header) < 4:
-        print("Ошибка получения заголовка от сервера.")
+    if response is None:
         return
-
-    data_length = struct.unpack('!I', header)[0]
-    received = b""
-    while len(received) < data_length:
-        try:
-            chunk = sock.recv(4096)
-            if not chunk:
-                break
-            received += chunk
-        except Exception as e:
-            logging.error("Ошибка при получении данных: %s", e)
-            print("Ошибка получения данных.")
-            return
+    status, received = response
 
     if status == b'0':
         # Сообщение об ошибке
@@ -118,8 +178,13 @@ def parse_arguments():
 def main():
     args = parse_arguments()
     with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        # Буферы задаются до подключения, чтобы учитываться при согласовании окна TCP
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
         try:
             sock.connect((args.host, args.port))
+            # Отключаем алгоритм Нейгла: короткие команды уходят без задержки
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             logging.info("Подключение к серверу %s:%s установлено", args.host, args.port)
         except Exception as e:
             logging.error("Ошибка подключения: %s", e)
@@ -5,312 +5,579 @@
 принимает подключения клиентов и обрабатывает их запросы.
 """
 
+import asyncio
 import os
 import json
 import logging
+import math
+import multiprocessing
+import signal
 import socket
+import sys
 import threading
-import tempfile
+import wave
 import struct
+import tempfile
 import argparse
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 from pydub import AudioSegment
+from pydub.utils import mediainfo
 
 # Конфигурация логирования
 logging.basicConfig(
     level=logging.INFO, format='[%(asctime)s] %(levelname)s: %(message)s'
 )
+logger = logging.getLogger(__name__)
 
 # Список поддерживаемых аудио расширений
 SUPPORTED_EXTENSIONS = ('.wav', '.mp3', '.ogg', '.flac')
 
+# Метаданные аудиофайла; после запуска сервера не изменяются
+AudioMeta = namedtuple('AudioMeta', 'filename duration_sec format')
+
+# Коды операций бинарного протокола запросов
+OP_LIST = 1
+OP_GET = 2
+
+# Заголовок бинарного запроса GET после кода операции:
+# длина имени файла (байт), начало и конец отрезка (сек)
+GET_HEADER = struct.Struct('!H2d')
+
+# Длина данных в заголовке ответа (4 байта, сетевой порядок)
+_PACK_U32 = struct.Struct('!I').pack
+
+# Заголовок WAV-файла в формате PCM и заголовок блока RIFF
+WAVE_FORMAT_PCM = 0x0001
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+_RIFF_CHUNK = struct.Struct('<4sI')
+
+# Размер буферов отправки и приёма сокета (байт)
+SOCKET_BUFFER_SIZE = 2 * 1024 * 1024
+
+# Размер стека рабочих потоков (байт); по умолчанию в Linux - 8 МБ
+WORKER_STACK_SIZE = 256 * 1024
+
+# Максимальный суммарный объём декодированных данных в кэше (байт)
+AUDIO_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Кэш декодированных аудиофайлов: путь -> (время изменения, AudioSegment, размер)
+_AUDIO_CACHE = OrderedDict()
+_AUDIO_CACHE_LOCK = threading.Lock()
+
+# Блокировки декодирования по пути, чтобы файл декодировался одним потоком
+_DECODE_LOCKS = {}
+
+
+def _probe_duration(file_path):
+    """
+    Возвращает длительность аудиофайла в секундах.
+    Файл не декодируется: WAV читается модулем wave, остальные форматы -
+    через ffprobe, который разбирает только заголовки контейнера.
+    """
+    if file_path.lower().endswith('.wav'):
+        try:
+            with wave.open(file_path, 'rb') as wf:
+                return round(wf.getnframes() / wf.getframerate(), 2)
+        except wave.Error:
+            # Не PCM - длительность определит ffprobe
+            pass
+
+    duration = mediainfo(file_path).get('duration')
+    if duration is None:
+        raise ValueError("не удалось определить длительность")
+    return round(float(duration), 2)
+
 
 def load_audio_metadata(audio_dir, metadata_file):
     """
     Сканирует директорию с аудиофайлами, собирает метаданные и сохраняет их в JSON-файл.
     Если директория не существует, создаёт её.
+    Возвращает неизменяемый кортеж записей AudioMeta.
     """
     metadata_list = []
 
     if not os.path.exists(audio_dir):
-        logging.warning("Директория '%s' не найдена. Создаю новую.", audio_dir)
+        logger.warning("Директория '%s' не найдена. Создаю новую.", audio_dir)
         try:
             os.makedirs(audio_dir)
         except Exception as exc:
-            logging.error("Не удалось создать директорию '%s': %s", audio_dir, exc)
-            return metadata_list
-
-    for filename in os.listdir(audio_dir):
-        if filename.lower().endswith(SUPPORTED_EXTENSIONS):
-            file_path = os.path.join(audio_dir, filename)
+            logger.error("Не удалось создать директорию '%s': %s", audio_dir, exc)
+            return ()
+
+    # DirEntry кэширует тип файла, полученный при чтении каталога,
+    # поэтому is_file() обычно не требует отдельного системного вызова
+    with os.scandir(audio_dir) as entries:
+        audio_entries = [
+            entry for entry in entries
+            if entry.name.lower().endswith(SUPPORTED_EXTENSIONS) and entry.is_file()
+        ]
+
+    # Заголовки файлов читаются параллельно: ffprobe - отдельный процесс,
+    # поэтому пула потоков достаточно
+    with ThreadPoolExecutor() as executor:
+        futures = [executor.submit(_probe_duration, entry.path) for entry in audio_entries]
+        for entry, future in zip(audio_entries, futures):
+            filename = entry.name
             try:
-                audio = AudioSegment.from_file(file_path)
-                duration_sec = round(len(audio) / 1000.0, 2)  # длительность в секундах
-                file_format = os.path.splitext(filename)[1][1:]
-                metadata_list.append({
-                    'filename': filename,
-                    'duration_sec': duration_sec,
-                    'format': file_format
-                })
+                duration_sec = future.result()
             except Exception as e:
-                logging.error("Ошибка обработки файла '%s': %s", filename, e)
+                logger.error("Ошибка обработки файла '%s': %s", filename, e)
+                continue
+            file_format = os.path.splitext(filename)[1][1:]
+            metadata_list.append(AudioMeta(filename, duration_sec, file_format))
 
     try:
         with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata_list, f, indent=4)
-        logging.info("Метаданные сохранены в '%s'", metadata_file)
+            json.dump([meta._asdict() for meta in metadata_list], f, indent=4)
+        logger.info("Метаданные сохранены в '%s'", metadata_file)
     except Exception as e:
-        logging.error("Ошибка сохранения метаданных: %s", e)
-    return metadata_list
+        logger.error("Ошибка сохранения метаданных: %s", e)
+    return tuple(metadata_list)
 
 
-def handle_client(conn, addr, audio_dir, metadata_list):
+def _cached_audio(file_path, mtime):
     """
-    Обработка запросов от подключившегося клиента.
-    Поддерживаемые команды:
-    - LIST: отправка списка аудиофайлов с метаданными;
-    - GET <имя_файла> <начало> <конец>: вырезка указанного отрезка и отправка данных.
-    Дополнительные проверки:
-    - Проверка корректности количества параметров.
-    - Проверка наличия запрошенного файла в списке аудиофайлов.
-    - Проверка валидности временных интервалов (числовой формат, неотрицательность,
-      а также соответствие длительности файла).
+    Возвращает аудиофайл из кэша или None, если его нет или он устарел.
+    Вызывается под _AUDIO_CACHE_LOCK.
     """
-    logging.info("Подключение клиента %s:%s", addr[0], addr[1])
-    try:
-        while True:
-            data = conn.recv(1024)
-            if not data:
-                break
-            command_line = data.decode('utf-8').strip()
-            logging.info("Получена команда от %s: %s", addr, command_line)
-            parts = command_line.split()
-            if not parts:
-                err_msg = "Пустой запрос."
-                logging.info(err_msg)
-                conn.sendall(err_msg.encode('utf-8'))
-                continue
-
-            command = parts[0].upper()
-
-            if command == 'LIST':
-                # Если у команды LIST есть лишние параметры, отправляем уведомление
-                if len(parts) != 1:
-                    err_msg = "Команда LIST не принимает параметры."
-                    logging.info(err_msg)
-                    conn.sendall(err_msg.encode('utf-8'))
-                    continue
-                response = json.dumps(metadata_list)
-                conn.sendall(response.encode('utf-8'))
-
-
-            elif command == 'GET':
-
-                # Ожидаем ровно 4 параметра: GET, имя_файла, начало, конец
-
-                if len(parts) != 4:
-                    err_msg = "Неверный формат команды GET. Используйте: GET <имя_файла> <начало> <конец>"
-
-                    logging.info(err_msg)
-
-                    err_bytes = err_msg.encode('utf-8')
-
-                    # Отправляем статус ошибки (0) + длину сообщения + само сообщение
-
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
-
-                    continue
-
-                filename = parts[1]
-
-                # Проверка, что имя файла присутствует в списке метаданных
-
-                if not any(item['filename'] == filename for item in metadata_list):
-                    err_msg = f"Файл '{filename}' не найден."
-
-                    logging.info(err_msg)
-
-                    err_bytes = err_msg.encode('utf-8')
-
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
-
-                    continue
-
-                try:
-
-                    start_sec = float(parts[2])
-
-                    end_sec = float(parts[3])
-
-                except ValueError:
-
-                    err_msg = "Параметры времени должны быть числами."
-
-                    logging.info(err_msg)
-
-                    err_bytes = err_msg.encode('utf-8')
-
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
-
-                    continue
-
-                if start_sec < 0 or end_sec < 0:
-                    err_msg = "Временные параметры не могут быть отрицательными."
-
-                    logging.info(err_msg)
-
-                    err_bytes = err_msg.encode('utf-8')
-
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
-
-                    continue
-
-                file_path = os.path.join(audio_dir, filename)
-
-                if not os.path.exists(file_path):
-                    err_msg = f"Файл '{filename}' не найден в файловой системе."
-
-                    logging.info(err_msg)
-
-                    err_bytes = err_msg.encode('utf-8')
-
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
-
-                    continue
-
-                try:
-
-                    audio = AudioSegment.from_file(file_path)
-
-                    file_duration_sec = len(audio) / 1000.0
-
-                except Exception as e:
-
-                    err_msg = f"Ошибка чтения аудиофайла: {e}"
-
-                    logging.info(err_msg)
-
-                    err_bytes = err_msg.encode('utf-8')
-
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
-
-                    continue
+    cached = _AUDIO_CACHE.get(file_path)
+    if cached is not None and cached[0] == mtime:
+        _AUDIO_CACHE.move_to_end(file_path)
+        return cached[1]
+    return None
 
-                if start_sec >= end_sec:
-                    err_msg = "Начальное время должно быть меньше конечного."
 
-                    logging.info(err_msg)
-
-                    err_bytes = err_msg.encode('utf-8')
-
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
-
-                    continue
-
-                if end_sec > file_duration_sec:
-                    err_msg = f"Конечное время ({end_sec} сек) превышает длительность файла ({file_duration_sec} сек)."
+def _get_audio(file_path):
+    """
+    Возвращает декодированный аудиофайл, используя кэш.
+    Файл декодируется повторно, только если он изменился на диске
+    или был вытеснен из кэша (политика LRU, ограничение по объёму данных).
+    Одновременные запросы одного файла ждут единственного декодирования.
+    """
+    mtime = os.path.getmtime(file_path)
+    with _AUDIO_CACHE_LOCK:
+        audio = _cached_audio(file_path, mtime)
+        if audio is not None:
+            return audio
+        decode_lock = _DECODE_LOCKS.setdefault(file_path, threading.Lock())
+
+    with decode_lock:
+        # Пока ждали блокировку, файл мог декодировать другой поток
+        with _AUDIO_CACHE_LOCK:
+            audio = _cached_audio(file_path, mtime)
+            if audio is not None:
+                return audio
+
+        audio = AudioSegment.from_file(file_path)
+        size = len(audio.raw_data)
+        with _AUDIO_CACHE_LOCK:
+            _AUDIO_CACHE.pop(file_path, None)
+            # Файл больше всего кэша не сохраняем, чтобы не вытеснять остальные
+            if size <= AUDIO_CACHE_MAX_BYTES:
+                _AUDIO_CACHE[file_path] = (mtime, audio, size)
+                while sum(entry[2] for entry in _AUDIO_CACHE.values()) > AUDIO_CACHE_MAX_BYTES:
+                    _AUDIO_CACHE.popitem(last=False)
+    return audio
+
+
+def _plan_wav_slice(file_path, start_sec, end_sec):
+    """
+    Готовит отправку отрезка WAV-файла (PCM) без декодирования.
+    Возвращает открытый исходный файл, заголовок WAV для отрезка, смещение
+    и длину его кадров в файле или None, если файл не в формате PCM.
+    Файл остаётся открытым, чтобы кадры отправлялись из того же файла,
+    по которому рассчитан заголовок.
+    """
+    try:
+        with wave.open(file_path, 'rb') as wf:
+            nchannels = wf.getnchannels()
+            sampwidth = wf.getsampwidth()
+            rate = wf.getframerate()
+    except wave.Error:
+        # Модуль wave поддерживает только PCM, остальное обрабатывает pydub
+        return None
+
+    frame_size = nchannels * sampwidth
+    f = open(file_path, 'rb')
+    try:
+        data_offset, data_size = _find_wav_data(f)
+        # Не выходим за конец файла, даже если заголовок указывает больший размер
+        data_size = min(data_size, os.fstat(f.fileno()).st_size - data_offset)
+    except Exception:
+        f.close()
+        raise
+
+    total_frames = data_size // frame_size
+    start_frame = min(int(start_sec * rate), total_frames)
+    n_frames = min(int((end_sec - start_sec) * rate), total_frames - start_frame)
+    length = n_frames * frame_size
+
+    header = _WAV_HEADER.pack(
+        b'RIFF', 36 + length, b'WAVE',
+        b'fmt ', 16, WAVE_FORMAT_PCM, nchannels, rate,
+        rate * frame_size, frame_size, sampwidth * 8,
+        b'data', length
+    )
+    return f, header, data_offset + start_frame * frame_size, length
 
-                    logging.info(err_msg)
 
-                    err_bytes = err_msg.encode('utf-8')
+def _find_wav_data(f):
+    """
+    Находит в WAV-файле блок 'data'.
+    Возвращает смещение начала кадров и размер блока в байтах.
+    """
+    f.seek(12)
+    while True:
+        chunk_header = f.read(_RIFF_CHUNK.size)
+        if len(chunk_header) < _RIFF_CHUNK.size:
+            raise wave.Error("блок 'data' не найден")
+        chunk_id, chunk_size = _RIFF_CHUNK.unpack(chunk_header)
+        if chunk_id == b'data':
+            return f.tell(), chunk_size
+        # Блоки RIFF выравниваются по чётной границе
+        f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+
+def _cut_segment(file_path, start_sec, end_sec):
+    """
+    Вырезает отрезок аудиофайла с помощью pydub и возвращает временный файл
+    с данными в формате исходного файла; файл затем отправляется через sendfile.
+    """
+    suffix = os.path.splitext(file_path)[1].lower()
+    audio = _get_audio(file_path)
+    segment = audio[int(start_sec * 1000):int(end_sec * 1000)]
 
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
+    out = tempfile.TemporaryFile()
+    try:
+        segment.export(out, format=suffix[1:])
+    except Exception:
+        out.close()
+        raise
+    return out
 
-                    continue
 
-                try:
+async def _send_framed(writer, status, payload):
+    """
+    Отправляет ответ клиенту одной записью:
+    1 байт статуса + 4 байта длины + полезная нагрузка.
+    """
+    writer.write(status + _PACK_U32(len(payload)) + payload)
+    await writer.drain()
 
-                    start_ms = int(start_sec * 1000)
 
-                    end_ms = int(end_sec * 1000)
+async def _send_err(writer, err_msg):
+    """
+    Отправляет клиенту сообщение об ошибке со статусом ошибки (0).
+    Ошибки запросов пишутся в журнал на уровне DEBUG, чтобы при частых
+    некорректных запросах журнал не тормозил обработку.
+    """
+    logger.debug("Ошибка запроса: %s", err_msg)
+    await _send_framed(writer, b'0', err_msg.encode('utf-8'))
 
-                    segment = audio[start_ms:end_ms]
 
-                    suffix = os.path.splitext(filename)[1]
+async def _send_file(writer, status, file):
+    """
+    Отправляет ответ, данные которого находятся в файле.
+    Содержимое передаётся через sendfile без копирования в память процесса.
+    Возвращает размер отправленных данных.
+    """
+    size = file.seek(0, os.SEEK_END)
+    file.seek(0)
+    writer.write(status + _PACK_U32(size))
+    await writer.drain()
+    sent = await asyncio.get_running_loop().sendfile(writer.transport, file)
+    if sent != size:
+        raise ConnectionError(f"отправлено {sent} байт из {size}")
+    return size
 
-                    # Создание временного файла без блокировки (delete=False)
 
-                    tmp = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+async def _send_wav_slice(writer, status, file, header, offset, length):
+    """
+    Отправляет отрезок WAV-файла: новый заголовок пишется в поток,
+    кадры передаются из открытого исходного файла через sendfile, так что
+    отрезок целиком не загружается в память.
+    Возвращает размер отправленных данных.
+    """
+    size = len(header) + length
+    writer.write(status + _PACK_U32(size) + header)
+    await writer.drain()
+    if length:
+        sent = await asyncio.get_running_loop().sendfile(
+            writer.transport, file, offset, length
+        )
+        if sent != length:
+            # Файл укоротился после расчёта заголовка
+            raise ConnectionError(f"отправлено {sent} байт кадров из {length}")
+    return size
+
+
+async def _handle_get(writer, addr, audio_dir, metadata_by_name, filename, start_sec, end_sec):
+    """
+    Проверяет параметры запроса GET, вырезает отрезок и отправляет его клиенту.
+    Проверки:
+    - наличие запрошенного файла в списке аудиофайлов и в файловой системе;
+    - валидность временных интервалов (неотрицательность, порядок,
+      соответствие длительности файла).
+    """
+    # Проверка, что имя файла присутствует в списке метаданных
+    meta = metadata_by_name.get(filename)
+    if meta is None:
+        err_msg = f"Файл '{filename}' не найден."
+        await _send_err(writer, err_msg)
+        return
 
-                    tmp_name = tmp.name
+    # NaN и бесконечность можно передать в бинарном запросе напрямую
+    if not math.isfinite(start_sec) or not math.isfinite(end_sec):
+        err_msg = "Параметры времени должны быть числами."
+        await _send_err(writer, err_msg)
+        return
 
-                    tmp.close()
+    if start_sec < 0 or end_sec < 0:
+        err_msg = "Временные параметры не могут быть отрицательными."
+        await _send_err(writer, err_msg)
+        return
 
-                    try:
+    file_path = os.path.join(audio_dir, filename)
+    if not os.path.exists(file_path):
+        err_msg = f"Файл '{filename}' не найден в файловой системе."
+        await _send_err(writer, err_msg)
+        return
 
-                        segment.export(tmp_name, format=suffix[1:])
+    if start_sec >= end_sec:
+        err_msg = "Начальное время должно быть меньше конечного."
+        await _send_err(writer, err_msg)
+        return
 
-                        with open(tmp_name, 'rb') as f:
+    # Длительность берём из метаданных, не декодируя файл повторно
+    file_duration_sec = meta.duration_sec
+    if end_sec > file_duration_sec:
+        err_msg = f"Конечное время ({end_sec} сек) превышает длительность файла ({file_duration_sec} сек)."
+        await _send_err(writer, err_msg)
+        return
 
-                            segment_data = f.read()
+    loop = asyncio.get_running_loop()
+    try:
+        # Чтение и кодирование файлов выполняются в пуле потоков,
+        # чтобы не блокировать цикл событий
+        wav_slice = None
+        if file_path.lower().endswith('.wav'):
+            wav_slice = await loop.run_in_executor(
+                None, _plan_wav_slice, file_path, start_sec, end_sec
+            )
+        if wav_slice is None:
+            segment_file = await loop.run_in_executor(
+                None, _cut_segment, file_path, start_sec, end_sec
+            )
+    except Exception as e:
+        # Сбой на стороне сервера, а не ошибка запроса - пишем в журнал всегда
+        logger.error("Ошибка обработки аудио '%s': %s", filename, e)
+        err_msg = f"Ошибка обработки аудио: {e}"
+        await _send_err(writer, err_msg)
+        return
 
-                    finally:
+    # Отправляем статус успеха (1), длину аудиоданных и сами данные.
+    # После заголовка сообщить об ошибке уже нельзя: клиент ждёт аудиоданные,
+    # поэтому при сбое соединение закрывается
+    try:
+        if wav_slice is not None:
+            with wav_slice[0]:
+                segment_size = await _send_wav_slice(writer, b'1', *wav_slice)
+        else:
+            with segment_file:
+                segment_size = await _send_file(writer, b'1', segment_file)
+    except Exception:
+        writer.close()
+        raise
+
+    logger.info(
+        "Отправлен аудио отрезок '%s' (%d байт) клиенту %s",
+        filename, segment_size, addr
+    )
 
-                        os.remove(tmp_name)
 
-                    # Отправляем статус успеха (1), длину аудиоданных и сами данные
+async def _handle_text_command(writer, addr, audio_dir, list_response, metadata_by_name, data):
+    """
+    Обработка команды текстового протокола (строка, оканчивающаяся '\\n'):
+    - LIST: отправка списка аудиофайлов с метаданными;
+    - GET <имя_файла> <начало> <конец>: вырезка указанного отрезка и отправка данных.
+    """
+    command_line = data.decode('utf-8').strip()
+    logger.info("Получена команда от %s: %s", addr, command_line)
+    parts = command_line.split()
+    if not parts:
+        err_msg = "Пустой запрос."
+        await _send_err(writer, err_msg)
+        return
 
-                    conn.sendall(b'1' + struct.pack('!I', len(segment_data)) + segment_data)
+    command = parts[0].upper()
 
-                    logging.info(
+    if command == 'LIST':
+        # Если у команды LIST есть лишние параметры, отправляем уведомление
+        if len(parts) != 1:
+            err_msg = "Команда LIST не принимает параметры."
+            await _send_err(writer, err_msg)
+            return
+        writer.write(list_response)
+        await writer.drain()
 
-                        "Отправлен аудио отрезок '%s' (%d байт) клиенту %s",
+    elif command == 'GET':
+        # Ожидаем ровно 4 параметра: GET, имя_файла, начало, конец
+        if len(parts) != 4:
+            err_msg = "Неверный формат команды GET. Используйте: GET <имя_файла> <начало> <конец>"
+            await _send_err(writer, err_msg)
+            return
 
-                        filename, len(segment_data), addr
+        try:
+            start_sec = float(parts[2])
+            end_sec = float(parts[3])
+        except ValueError:
+            err_msg = "Параметры времени должны быть числами."
+            await _send_err(writer, err_msg)
+            return
+
+        await _handle_get(
+            writer, addr, audio_dir, metadata_by_name, parts[1], start_sec, end_sec
+        )
+    else:
+        err_msg = f"Неизвестная команда: {command}"
+        await _send_err(writer, err_msg)
+
+
+async def handle_client(reader, writer, audio_dir, list_response, metadata_by_name):
+    """
+    Обработка запросов от подключившегося клиента.
+    Поддерживаются два протокола запросов:
+    - бинарный: 1 байт кода операции (OP_LIST, OP_GET); для OP_GET далее
+      следуют длина имени файла, начало и конец отрезка (GET_HEADER)
+      и имя файла в UTF-8;
+    - текстовый (для совместимости): строки LIST и GET <имя_файла> <начало> <конец>.
+    """
+    addr = writer.get_extra_info('peername')
+    sock = writer.get_extra_info('socket')
+    # Отключаем алгоритм Нейгла: заголовки ответов уходят без задержки
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # Увеличенные буферы сокета ускоряют передачу больших аудиофрагментов
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SOCKET_BUFFER_SIZE)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+    logger.info("Подключение клиента %s:%s", addr[0], addr[1])
+    try:
+        # StreamReader накапливает данные сокета в собственном буфере соединения
+        # и читает их крупными блоками, поэтому команды, пришедшие одним пакетом,
+        # разбираются из буфера без дополнительных системных вызовов
+        while True:
+            opcode = await reader.read(1)
+            if not opcode:
+                break
 
-                    )
+            if opcode[0] == OP_LIST:
+                logger.info("Получена команда от %s: LIST", addr)
+                writer.write(list_response)
+                await writer.drain()
+
+            elif opcode[0] == OP_GET:
+                name_len, start_sec, end_sec = GET_HEADER.unpack(
+                    await reader.readexactly(GET_HEADER.size)
+                )
+                filename = (await reader.readexactly(name_len)).decode('utf-8')
+                logger.info(
+                    "Получена команда от %s: GET %s %s %s", addr, filename, start_sec, end_sec
+                )
+                await _handle_get(
+                    writer, addr, audio_dir, metadata_by_name, filename, start_sec, end_sec
+                )
 
-                except Exception as e:
+            else:
+                # Текстовый протокол: дочитываем строку команды,
+                # если прочитанный байт не был её концом
+                data = opcode
+                if opcode != b'\n':
+                    data += await reader.readline()
+                await _handle_text_command(
+                    writer, addr, audio_dir, list_response, metadata_by_name, data
+                )
+    except Exception as e:
+        logger.error("Ошибка в обработке клиента %s: %s", addr, e)
+    finally:
+        writer.close()
+        logger.info("Закрыто соединение с клиентом %s:%s", addr[0], addr[1])
 
-                    err_msg = f"Ошибка обработки аудио: {e}"
 
-                    logging.info(err_msg)
+async def _serve(audio_dir, host, port, metadata_list, reuse_port):
+    """
+    Создаёт асинхронный сервер и обслуживает подключения до остановки.
+    """
+    # Индекс метаданных по имени файла для проверки запросов GET за O(1)
+    metadata_by_name = {meta.filename: meta for meta in metadata_list}
+    # Ответ на LIST не меняется после запуска, поэтому собирается один раз
+    list_payload = orjson.dumps([meta._asdict() for meta in metadata_list])
+    list_response = b'L' + _PACK_U32(len(list_payload)) + list_payload
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_client(
+            reader, writer, audio_dir, list_response, metadata_by_name
+        ),
+        host, port, reuse_port=reuse_port
+    )
+    logger.info("Сервер запущен на %s:%s (PID %d)", host, port, os.getpid())
+    async with server:
+        await server.serve_forever()
 
-                    err_bytes = err_msg.encode('utf-8')
 
-                    conn.sendall(b'0' + struct.pack('!I', len(err_bytes)) + err_bytes)
-            else:
-                err_msg = f"Неизвестная команда: {command}"
-                logging.info(err_msg)
-                conn.sendall(err_msg.encode('utf-8'))
-    except Exception as e:
-        logging.error("Ошибка в обработке клиента %s: %s", addr, e)
-    finally:
-        conn.close()
-        logging.info("Закрыто соединение с клиентом %s:%s", addr[0], addr[1])
+def _run_worker(audio_dir, host, port, metadata_list, reuse_port):
+    """
+    Запускает цикл событий сервера в дочернем процессе.
+    """
+    threading.stack_size(WORKER_STACK_SIZE)
+    try:
+        asyncio.run(_serve(audio_dir, host, port, metadata_list, reuse_port))
+    except KeyboardInterrupt:
+        pass
 
 
-def start_server(audio_dir, host, port):
+def start_server(audio_dir, host, port, workers=1):
     """
     Запускает сервер, создаёт список метаданных и принимает подключения.
+    При workers > 1 запускает несколько процессов, слушающих один порт
+    через SO_REUSEPORT; ядро распределяет подключения между ними.
     """
+    # Уменьшаем стек потоков пулов, в которых читаются и режутся аудиофайлы
+    threading.stack_size(WORKER_STACK_SIZE)
+
     metadata_file = os.path.join(audio_dir, 'metadata.json')
     metadata_list = load_audio_metadata(audio_dir, metadata_file)
 
-    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    try:
-        server_socket.bind((host, port))
-    except Exception as e:
-        logging.error("Ошибка привязки к %s:%s - %s", host, port, e)
-        return
-
-    server_socket.listen(5)
-    logging.info("Сервер запущен на %s:%s", host, port)
+    reuse_port = workers > 1
+    if reuse_port and not hasattr(socket, 'SO_REUSEPORT'):
+        logger.warning("SO_REUSEPORT не поддерживается системой, запускается один процесс.")
+        reuse_port = False
+        workers = 1
+
+    processes = []
+    for _ in range(workers - 1):
+        process = multiprocessing.Process(
+            target=_run_worker,
+            args=(audio_dir, host, port, metadata_list, reuse_port),
+            daemon=True
+        )
+        process.start()
+        processes.append(process)
+    if processes:
+        # При SIGTERM выходим через finally, чтобы остановить и дочерние процессы
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
 
     try:
-        while True:
-            conn, addr = server_socket.accept()
-            client_thread = threading.Thread(
-                target=handle_client, args=(conn, addr, audio_dir, metadata_list)
-            )
-            client_thread.daemon = True
-            client_thread.start()
+        asyncio.run(_serve(audio_dir, host, port, metadata_list, reuse_port))
     except KeyboardInterrupt:
-        logging.info("Сервер остановлен вручную.")
+        logger.info("Сервер остановлен вручную.")
+    except OSError as e:
+        logger.error("Ошибка привязки к %s:%s - %s", host, port, e)
     except Exception as e:
-        logging.error("Ошибка сервера: %s", e)
+        logger.error("Ошибка сервера: %s", e)
     finally:
-        server_socket.close()
+        for process in processes:
+            process.terminate()
 
 
 def parse_arguments():
@@ -330,12 +597,16 @@ def parse_arguments():
         '--port', type=int, default=5000,
         help="Порт для прослушивания (по умолчанию 5000)"
     )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help="Число процессов сервера (по умолчанию 1; больше 1 - при поддержке SO_REUSEPORT)"
+    )
     return parser.parse_args()
 
 
 def main():
     args = parse_arguments()
-    start_server(args.audio_dir, args.host, args.port)
+    start_server(args.audio_dir, args.host, args.port, max(args.workers, 1))
 
 
 if __name__ == '__main__':